@@ -1,9 +1,15 @@
 from flask import Flask, request, jsonify
 from sentence_transformers import SentenceTransformer
 import faiss
+import base64
+import binascii
+import hashlib
 import json
 import numpy as np
 import os
+import threading
+import zlib
+from collections import OrderedDict
 
 app = Flask(__name__)
 
@@ -17,40 +23,130 @@ index = faiss.read_index("embedding_index/index.faiss")
 with open("embedding_index/assessments.json", "r", encoding="utf-8") as f:
     assessments = json.load(f)
 
+DEFAULT_K = 10
+MAX_K = 50  # Keeps a single response payload small
+MAX_QUERY_CHARS = 10000  # The model only reads the first 256 tokens anyway
+
+# Full ranked (ids, distances) per query, so later pages are a slice instead of another search.
+# Bounded LRU keyed by a digest of the query, local to each worker process; cursors encode the
+# query so any worker can rebuild it.
+CURSOR_CACHE_SIZE = 256
+ranking_cache = OrderedDict()
+ranking_lock = threading.Lock()
+
 @app.route("/")
 def home():
     return "SHL Assessment Recommender API is running."
 
 @app.route("/recommend", methods=["POST"])
 def recommend_post():
-    data = request.get_json()
-    query = data.get("query", "")
-
-    if not query:
-        return jsonify({"error": "Query not provided."}), 400
-
-    return run_recommendation(query)
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object."}), 400
+    return handle_recommend(data)
 
 @app.route("/recommend", methods=["GET"])
 def recommend_get():
-    query = request.args.get("query", "")
+    return handle_recommend(request.args)
+
+def parse_int(value, default):
+    # Query strings give "10", JSON gives 10; anything else (true, 2.7, "2.7") is rejected
+    if value is None:
+        return default
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    raise ValueError(value)
+
+def handle_recommend(params):
+    query = params.get("query", "")
+    cursor = params.get("cursor", "")
+
+    if not isinstance(query, str) or not isinstance(cursor, str):
+        return jsonify({"error": "query and cursor must be strings."}), 400
+
+    if not query and cursor:
+        query = decode_cursor(cursor)
+        if query is None:
+            return jsonify({"error": "Invalid cursor."}), 400
 
     if not query:
-        return jsonify({"error": "Query parameter is required."}), 400
-
-    return run_recommendation(query)
+        return jsonify({"error": "Query not provided."}), 400
 
-def run_recommendation(query):
+    if len(query) > MAX_QUERY_CHARS:
+        return jsonify({"error": f"Query must be at most {MAX_QUERY_CHARS} characters."}), 400
+
+    try:
+        k = parse_int(params.get("k"), DEFAULT_K)
+        offset = parse_int(params.get("offset"), 0)
+    except ValueError:
+        return jsonify({"error": "k and offset must be integers."}), 400
+
+    if k < 1 or offset < 0:
+        return jsonify({"error": "k must be at least 1 and offset must not be negative."}), 400
+
+    k = min(k, MAX_K)
+    return run_recommendation(query, k=k, offset=offset)
+
+def make_cursor(query):
+    # The query itself, compressed, so a cursor never depends on which worker served it
+    packed = zlib.compress(query.encode("utf-8"))
+    return base64.urlsafe_b64encode(packed).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        packed = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        # Bounded inflate, so a small cursor cannot expand into a huge query
+        raw = zlib.decompressobj().decompress(packed, MAX_QUERY_CHARS * 4 + 1)
+        query = raw.decode("utf-8")
+    except (binascii.Error, zlib.error, UnicodeDecodeError, ValueError):
+        return None
+    if len(query) > MAX_QUERY_CHARS:
+        return None
+    return query
+
+def cache_key(query):
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+def get_ranking(query):
+    key = cache_key(query)
+    with ranking_lock:
+        ranking = ranking_cache.get(key)
+        if ranking is not None:
+            ranking_cache.move_to_end(key)
+        return ranking
+
+def store_ranking(query, ranking):
+    key = cache_key(query)
+    with ranking_lock:
+        ranking_cache[key] = ranking
+        ranking_cache.move_to_end(key)
+        while len(ranking_cache) > CURSOR_CACHE_SIZE:
+            ranking_cache.popitem(last=False)
+
+def rank_all(query):
     # Compute the embedding of the input query
     query_embedding = model.encode([query])
     query_embedding = np.array(query_embedding).astype("float32")
 
-    # Perform similarity search
-    k = min(10, len(assessments))
-    distances, indices = index.search(query_embedding, k)
+    # Rank the whole catalogue once; ties are broken by id so pages are deterministic
+    distances, indices = index.search(query_embedding, len(assessments))
+    ranked = sorted(
+        (float(d), int(i)) for d, i in zip(distances[0], indices[0]) if i >= 0
+    )
+    return [i for _, i in ranked], [d for d, _ in ranked]
+
+def run_recommendation(query, k=DEFAULT_K, offset=0):
+    ranking = get_ranking(query)
+    if ranking is None:
+        ranking = rank_all(query)
+        store_ranking(query, ranking)
+
+    ids, distances = ranking
 
     results = []
-    for idx in indices[0]:
+    for idx, distance in zip(ids[offset:offset + k], distances[offset:offset + k]):
         assessment = assessments[idx]
         results.append({
             "name": assessment["name"],
@@ -58,10 +154,20 @@ def run_recommendation(query):
             "remote_testing": assessment["remote_testing"],
             "adaptive_support": assessment["adaptive_support"],
             "duration": assessment["duration"],
-            "test_type": assessment["test_type"]
+            "test_type": assessment["test_type"],
+            "score": round(distance, 4)  # L2 distance, lower is closer
         })
 
-    return jsonify({"recommendations": results})
+    next_offset = offset + k if offset + k < len(ids) else None
+
+    return jsonify({
+        "recommendations": results,
+        "cursor": make_cursor(query),
+        "offset": offset,
+        "k": k,
+        "total": len(ids),
+        "next_offset": next_offset
+    })
 
 if __name__ == '__main__':
     app.run(debug=True)
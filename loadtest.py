@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import psutil
+import requests
+from requests.adapters import HTTPAdapter
+
+# Query corpus replayed round-robin against /recommend
+DEFAULT_QUERIES = [
+    "Entry-level .NET developer with MVC skills",
+    "Java developer who can collaborate with business teams, 40 minutes max",
+    "Mid-level Python, SQL and JavaScript engineer",
+    "Analyst with cognitive and personality tests under 45 minutes",
+    "Sales graduate role, situational judgement and communication",
+    "Senior data scientist with machine learning and statistics",
+    "Customer support executive with English comprehension",
+    "QA engineer familiar with Selenium and manual testing",
+    "Bank administrative assistant, numerical aptitude",
+    "Content writer with SEO and English grammar",
+]
+
+# Latency histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def parse_rates(value):
+    try:
+        rates = [float(r) for r in value.split(",") if r.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid rate list: {value!r}")
+    if not rates or any(r <= 0 for r in rates):
+        raise argparse.ArgumentTypeError("rates must be a non-empty list of values > 0")
+    return rates
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Open-loop load test for the recommender API.")
+    parser.add_argument("--rates", type=parse_rates, default="1,2,5,10,20,40",
+                        help="Comma separated target request rates (req/s) to step through.")
+    parser.add_argument("--duration", type=float, default=30,
+                        help="Seconds to hold each target rate.")
+    parser.add_argument("--concurrency", type=positive_int, default=32,
+                        help="Maximum in-flight requests on the client side.")
+    parser.add_argument("--workers", type=positive_int, default=1, help="gunicorn worker processes.")
+    parser.add_argument("--threads", type=positive_int, default=1, help="gunicorn threads per worker.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--url", default=None,
+                        help="Target an already running server instead of starting one locally.")
+    parser.add_argument("--queries", default=None,
+                        help="Text file with one query per line (defaults to the built-in corpus).")
+    parser.add_argument("--unique-queries", action="store_true",
+                        help="Salt every query so no two requests share text (bypasses the ranking cache).")
+    parser.add_argument("--k", type=int, default=None, help="Send k with every request.")
+    parser.add_argument("--offset", type=int, default=None, help="Send offset with every request.")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds.")
+    parser.add_argument("--sample-interval", type=float, default=0.5,
+                        help="Seconds between server CPU/RSS samples.")
+    parser.add_argument("--label", default=None,
+                        help="Free-text description of the build under test, shown in the report title.")
+    parser.add_argument("--output", default="loadtest_report",
+                        help="Report path prefix; writes <prefix>.md and <prefix>.json.")
+    return parser.parse_args()
+
+
+def load_queries(path):
+    if not path:
+        return DEFAULT_QUERIES
+    with open(path, "r", encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+    if not queries:
+        sys.exit(f"No queries found in {path}")
+    return queries
+
+
+def start_server(args):
+    cmd = [
+        sys.executable, "-m", "gunicorn", "app:app",
+        "--bind", f"127.0.0.1:{args.port}",
+        "--workers", str(args.workers),
+        "--threads", str(args.threads),
+        "--timeout", "120",
+    ]
+    server = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)))
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    # Model and index load on import, so wait for the health route to answer
+    deadline = time.time() + 180
+    while time.time() < deadline:
+        if server.poll() is not None:
+            sys.exit("gunicorn exited before becoming ready.")
+        try:
+            if requests.get(base_url + "/", timeout=1).status_code == 200:
+                return server, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+
+    stop_server(server)
+    sys.exit("Timed out waiting for the server to start.")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+class ResourceSampler(threading.Thread):
+    """Samples CPU and RSS of the server process tree (gunicorn master + workers)."""
+
+    def __init__(self, pid, interval):
+        super().__init__(daemon=True)
+        self.root = psutil.Process(pid)
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+        self._procs = {}
+        self.start_time = time.time()
+
+    def _tree(self):
+        procs = [self.root] + self.root.children(recursive=True)
+        for p in procs:
+            if p.pid not in self._procs:
+                # First cpu_percent call only primes the counter
+                p.cpu_percent(None)
+                self._procs[p.pid] = p
+        return procs
+
+    def run(self):
+        self._tree()
+        while not self._done.wait(self.interval):
+            cpu, rss = 0.0, 0
+            try:
+                for p in self._tree():
+                    try:
+                        cpu += self._procs[p.pid].cpu_percent(None)
+                        rss += p.memory_info().rss
+                    except psutil.NoSuchProcess:
+                        continue
+            except psutil.NoSuchProcess:
+                break
+            self.samples.append({
+                "t": round(time.time() - self.start_time, 2),
+                "cpu_percent": round(cpu, 1),
+                "rss_mb": round(rss / 2**20, 1),
+            })
+
+    def window(self, t0, t1):
+        return [s for s in self.samples if t0 <= s["t"] <= t1]
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def histogram(latencies_ms):
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for value in latencies_ms:
+        for i, bound in enumerate(BUCKETS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+def build_payload(query, salt, args):
+    if args.unique_queries:
+        query = f"{query} #{salt}"
+    payload = {"query": query}
+    if args.k is not None:
+        payload["k"] = args.k
+    if args.offset is not None:
+        payload["offset"] = args.offset
+    return payload
+
+
+def run_step(base_url, queries, rate, args):
+    """Fires requests on a fixed schedule regardless of how fast responses come back.
+
+    Latency is measured from the scheduled send time, so queueing delay on the
+    client is counted instead of hidden (avoids coordinated omission).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    total = int(rate * args.duration)
+    results = []
+    lock = threading.Lock()
+
+    def fire(i, scheduled):
+        payload = build_payload(queries[i % len(queries)], f"{rate:g}-{i}", args)
+        ok = False
+        try:
+            response = session.post(base_url + "/recommend", json=payload, timeout=args.timeout)
+            ok = response.status_code == 200
+        except Exception:
+            # Anything raised here would vanish in the unread future, so count it as a failure
+            pass
+        latency = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            results.append((latency, ok))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for i in range(total):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, i, scheduled)
+    elapsed = time.perf_counter() - start
+
+    # Percentiles cover every request, failed and timed-out ones included,
+    # so saturation shows up in the tail instead of being filtered out
+    latencies = np.array([r[0] for r in results])
+    ok_latencies = [r[0] for r in results if r[1]]
+    error_latencies = [r[0] for r in results if not r[1]]
+    step = {
+        "target_rps": rate,
+        "sent": total,
+        "ok": len(ok_latencies),
+        "errors": len(error_latencies),
+        "error_rate": round(len(error_latencies) / total, 4) if total else 0.0,
+        "achieved_rps": round(len(ok_latencies) / elapsed, 2) if elapsed else 0.0,
+        "histogram": histogram(ok_latencies),
+        "error_histogram": histogram(error_latencies),
+    }
+    if len(latencies):
+        step.update({
+            "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+            "p90_ms": round(float(np.percentile(latencies, 90)), 1),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 1),
+            "max_ms": round(float(latencies.max()), 1),
+        })
+    return step
+
+
+def write_report(args, steps, samples, prefix):
+    with open(prefix + ".json", "w", encoding="utf-8") as f:
+        json.dump({"config": vars(args), "steps": steps, "resource_samples": samples}, f, indent=2)
+
+    lines = [
+        "# Load test report" + (f": {args.label}" if args.label else ""),
+        "",
+        f"- Target: {args.url or 'local gunicorn'}",
+        "- gunicorn: external server, configuration unknown" if args.url
+        else f"- gunicorn: {args.workers} worker(s) x {args.threads} thread(s)",
+        f"- Client concurrency: {args.concurrency}, {args.duration:g}s per rate step",
+        f"- Queries: {'unique per request' if args.unique_queries else 'repeated corpus'}"
+        f", k={args.k if args.k is not None else 'default'}, offset={args.offset if args.offset is not None else 'default'}",
+        "",
+        "## Saturation curve",
+        "",
+        "| target rps | achieved rps | p50 ms | p90 ms | p99 ms | max ms | error rate | cpu % (mean) | rss MB (peak) |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for s in steps:
+        lines.append(
+            f"| {s['target_rps']:g} | {s['achieved_rps']} | {s.get('p50_ms', '-')} | {s.get('p90_ms', '-')} "
+            f"| {s.get('p99_ms', '-')} | {s.get('max_ms', '-')} | {s['error_rate']:.2%} "
+            f"| {s.get('cpu_percent_mean', '-')} | {s.get('rss_mb_peak', '-')} |"
+        )
+
+    lines += ["", "Percentiles include failed and timed-out requests.", ""]
+
+    for title, key in [("Latency histograms (successful requests)", "histogram"),
+                       ("Latency histograms (failed requests)", "error_histogram")]:
+        lines += [f"## {title}", ""]
+        labels = list(steps[0][key]) if steps else []
+        lines.append("| target rps | " + " | ".join(labels) + " |")
+        lines.append("|---" * (len(labels) + 1) + "|")
+        for s in steps:
+            lines.append(f"| {s['target_rps']:g} | " + " | ".join(str(c) for c in s[key].values()) + " |")
+        lines.append("")
+
+    with open(prefix + ".md", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def main():
+    args = parse_args()
+    queries = load_queries(args.queries)
+
+    server, sampler = None, None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        server, base_url = start_server(args)
+        sampler = ResourceSampler(server.pid, args.sample_interval)
+        sampler.start()
+
+    steps = []
+    run_start = sampler.start_time if sampler else time.time()
+    try:
+        # Warm up so the first step doesn't pay for lazy initialisation
+        for i, q in enumerate(queries[:3]):
+            response = requests.post(base_url + "/recommend", json=build_payload(q, f"warmup-{i}", args),
+                                     timeout=args.timeout)
+            if response.status_code != 200:
+                sys.exit(f"Warm-up request failed with HTTP {response.status_code}: {response.text[:200]}")
+
+        for rate in args.rates:
+            t0 = time.time() - run_start
+            step = run_step(base_url, queries, rate, args)
+            t1 = time.time() - run_start
+            if sampler:
+                window = sampler.window(t0, t1)
+                if window:
+                    step["cpu_percent_mean"] = round(float(np.mean([s["cpu_percent"] for s in window])), 1)
+                    step["rss_mb_peak"] = max(s["rss_mb"] for s in window)
+            steps.append(step)
+            print(f"{rate:g} rps -> achieved {step['achieved_rps']} rps, "
+                  f"p99 {step.get('p99_ms', '-')} ms, errors {step['error_rate']:.2%}")
+    finally:
+        if sampler:
+            sampler.stop()
+        if server:
+            stop_server(server)
+
+    write_report(args, steps, sampler.samples if sampler else [], args.output)
+    print(f"✅ Report written to {args.output}.md and {args.output}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ st.set_page_config(page_title="SHL Assessment Recommender", layout="wide")
 # Load FAISS index and assessment metadata
 INDEX_PATH = "embedding_index/index.faiss"
 ASSESSMENT_DATA_PATH = "embedding_index/assessments.json"
+MAX_K = 50  # Same cap as the API
 
 @st.cache_resource
 def load_model():
@@ -33,6 +34,9 @@ st.title("🔍 SHL Assessment Recommendation System")
 
 query = st.text_area("Enter Job Description or Hiring Requirement", height=200)
 
+col1, col2 = st.columns(2)
+k = col1.number_input("Results per page", min_value=1, max_value=MAX_K, value=10)
+
 if st.button("Get Recommendations"):
     if not query.strip():
         st.warning("Please enter a valid query.")
@@ -41,24 +45,40 @@ if st.button("Get Recommendations"):
         query_embedding = model.encode([query])
         query_embedding = np.array(query_embedding).astype("float32")
 
-        # Search FAISS index
-        k = min(10, len(assessments))  # Recommend up to 10
-        distances, indices = index.search(query_embedding, k)
+        # Rank the whole catalogue once and keep it, so paging is just a slice
+        distances, indices = index.search(query_embedding, len(assessments))
+        ranked = sorted((float(d), int(i)) for d, i in zip(distances[0], indices[0]) if i >= 0)
+        st.session_state["ranking"] = {
+            "query": query,
+            "ids": [i for _, i in ranked],
+            # A fresh page widget key per search so every new search opens at page 1
+            "search_id": st.session_state.get("ranking", {}).get("search_id", 0) + 1,
+        }
+
+ranking = st.session_state.get("ranking")
+
+# Only show results for the text currently in the box
+if ranking and ranking["query"] == query:
+    ranked_ids = ranking["ids"]
+    num_pages = max(1, -(-len(ranked_ids) // k))
+    page = col2.number_input("Page", min_value=1, max_value=num_pages, value=1,
+                             key=f"page-{ranking['search_id']}")
+    offset = (page - 1) * k
 
-        st.subheader("🎯 Top Recommended Assessments")
-        results = []
+    st.subheader("🎯 Top Recommended Assessments")
+    results = []
 
-        for i in indices[0]:
-            a = assessments[i]
-            results.append({
-                "Assessment Name": f"[{a['name']}]({a['url']})",
-                "Remote Testing Support": "✅" if a["remote_testing"] else "❌",
-                "Adaptive/IRT Support": "✅" if a["adaptive_support"] else "❌",
-                "Duration": a["duration"] if a["duration"] else "N/A",
-                "Test Type": a["test_type"]
-            })
+    for i in ranked_ids[offset:offset + k]:
+        a = assessments[i]
+        results.append({
+            "Assessment Name": f"[{a['name']}]({a['url']})",
+            "Remote Testing Support": "✅" if a["remote_testing"] else "❌",
+            "Adaptive/IRT Support": "✅" if a["adaptive_support"] else "❌",
+            "Duration": a["duration"] if a["duration"] else "N/A",
+            "Test Type": a["test_type"]
+        })
 
-        st.table(results)
+    st.table(results)
 
 st.markdown("""---  
 **Test Type Legend:**  